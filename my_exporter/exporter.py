@@ -1,14 +1,88 @@
 # my_exporter/exporter.py
 
 import os
+import re
 import json
+import operator
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Set, TextIO
 
+try:
+    import orjson  # Optional fast JSON parser/serializer (C extension)
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional incremental JSON parser for streaming large notebooks
+except ImportError:
+    ijson = None
+
 from pathspec import PathSpec
-from .ignore_handler import load_ignore_patterns, load_include_patterns
+from .ignore_handler import (
+    build_fast_match_tables,
+    build_fused_matcher,
+    build_fused_regex,
+    load_ignore_patterns,
+    load_include_patterns,
+)
 from .logger import logger  # <-- Import the logger
 
 
+def _json_loads(content):
+    """
+    Parse JSON content using `orjson` when available, falling back to the stdlib.
+
+    Args:
+        content (Union[str, bytes]): JSON text (or UTF-8 bytes) to parse.
+
+    Returns:
+        Any: The parsed JSON object.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps_indented(obj) -> str:
+    """
+    Serialize an object to indented JSON using `orjson` when available.
+
+    Args:
+        obj (Any): The object to serialize.
+
+    Returns:
+        str: JSON string with 2-space indentation.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _strip_outputs_inplace(nb: dict) -> bool:
+    """
+    Remove output cells from an already-parsed notebook dict, mutating it.
+
+    Args:
+        nb (dict): Parsed notebook JSON object.
+
+    Returns:
+        bool: True if any output or execution count was actually removed;
+        False when the notebook was already clean (callers can then skip
+        re-serializing it).
+    """
+    changed = False
+    for cell in nb.get('cells', []):
+        if cell.get('cell_type') == 'code':
+            if cell.get('outputs') or cell.get('execution_count') is not None:
+                changed = True
+            cell['outputs'] = []
+            cell['execution_count'] = None
+    return changed
+
+
 def strip_notebook_outputs(nb_content: str) -> str:
     """
     Remove all output cells from a Jupyter notebook's JSON content.
@@ -26,19 +100,112 @@ def strip_notebook_outputs(nb_content: str) -> str:
     """
     logger.debug("Stripping notebook outputs.")
     try:
-        nb = json.loads(nb_content)
-        for cell in nb.get('cells', []):
-            if cell.get('cell_type') == 'code':
-                cell['outputs'] = []
-                cell['execution_count'] = None
+        nb = _json_loads(nb_content)
+        _strip_outputs_inplace(nb)
         logger.debug("Successfully stripped notebook outputs.")
-        return json.dumps(nb, indent=2, ensure_ascii=False)
-    except json.JSONDecodeError as e:
+        return _json_dumps_indented(nb)
+    except ValueError as e:
+        # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
         logger.warning("Failed to parse notebook JSON. Returning original content.")
         logger.debug(f"JSONDecodeError: {e}")
         return nb_content
 
 
+def _reindent_json_block(block: str, pad: str) -> str:
+    """
+    Indent every line after the first of an already-serialized JSON block.
+
+    Args:
+        block (str): JSON text produced by :func:`_json_dumps_indented`.
+        pad (str): Whitespace prepended to each continuation line.
+
+    Returns:
+        str: The re-indented JSON block.
+    """
+    return block.replace('\n', '\n' + pad)
+
+
+def stream_stripped_notebook(src: TextIO, out: TextIO) -> None:
+    """
+    Stream a notebook from `src` to `out`, stripping code-cell outputs on the fly.
+
+    Unlike :func:`strip_notebook_outputs`, which materializes the whole notebook
+    (including potentially huge embedded outputs) as Python objects, this version
+    iterates the JSON incrementally with `ijson` so peak memory stays at roughly
+    one cell. Only available when the optional `ijson` dependency is installed.
+
+    Args:
+        src (TextIO): Readable file object positioned at the notebook JSON.
+        out (TextIO): Writable file object receiving the stripped JSON.
+
+    Raises:
+        RuntimeError: If `ijson` is not installed.
+        ValueError: If the notebook JSON cannot be parsed.
+    """
+    if ijson is None:
+        raise RuntimeError("stream_stripped_notebook requires the optional 'ijson' dependency.")
+
+    from ijson.common import ObjectBuilder
+
+    logger.debug("Stream-stripping notebook outputs via ijson.")
+
+    out.write('{\n  "cells": [')
+    first_cell = True
+    cell_builder = None
+    # Buffered top-level keys other than 'cells' (metadata, nbformat, ...);
+    # these are small compared to cell outputs, so holding them is cheap.
+    top_key = None
+    top_builder = None
+    top_depth = 0
+    trailing = []
+
+    for prefix, event, value in ijson.parse(src):
+        if prefix.startswith('cells.item'):
+            # Build one cell at a time, strip its outputs, and emit it.
+            if prefix == 'cells.item' and event == 'start_map':
+                cell_builder = ObjectBuilder()
+            cell_builder.event(event, value)
+            if prefix == 'cells.item' and event == 'end_map':
+                cell = cell_builder.value
+                cell_builder = None
+                if cell.get('cell_type') == 'code':
+                    cell['outputs'] = []
+                    cell['execution_count'] = None
+                out.write(',' if not first_cell else '')
+                first_cell = False
+                out.write('\n    ')
+                out.write(_reindent_json_block(_json_dumps_indented(cell), '    '))
+            continue
+
+        if prefix == '' and event == 'map_key':
+            top_key = value
+            continue
+        if (prefix == '' and event in ('start_map', 'end_map')) or \
+                (prefix == 'cells' and event in ('start_array', 'end_array')):
+            continue
+
+        # Any other event belongs to a top-level value other than 'cells'.
+        if top_builder is None:
+            top_builder = ObjectBuilder()
+        top_builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            top_depth += 1
+        elif event in ('end_map', 'end_array'):
+            top_depth -= 1
+        if top_depth == 0:
+            trailing.append((top_key, top_builder.value))
+            top_builder = None
+
+    out.write('\n  ]' if not first_cell else ']')
+    for key, value in trailing:
+        out.write(',\n  ')
+        out.write(json.dumps(key))
+        out.write(': ')
+        out.write(_reindent_json_block(_json_dumps_indented(value), '  '))
+    out.write('\n}')
+    logger.debug("Successfully stream-stripped notebook outputs.")
+
+
 def convert_nb_to_py(nb_stripped_json: str) -> str:
     """
     Convert a stripped Jupyter notebook JSON into a Python (.py) file representation.
@@ -60,33 +227,50 @@ def convert_nb_to_py(nb_stripped_json: str) -> str:
     """
     logger.debug("Converting stripped notebook JSON to .py format.")
     try:
-        nb = json.loads(nb_stripped_json)
-    except json.JSONDecodeError as e:
+        nb = _json_loads(nb_stripped_json)
+    except ValueError as e:
+        # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
         logger.warning("Failed to parse stripped notebook JSON. Returning original content.")
         logger.debug(f"JSONDecodeError: {e}")
         return nb_stripped_json
 
+    return _nb_dict_to_py(nb)
+
+
+def _nb_dict_to_py(nb: dict) -> str:
+    """
+    Render an already-parsed notebook dict as .py-style text.
+
+    Args:
+        nb (dict): Parsed notebook JSON object (outputs already stripped).
+
+    Returns:
+        str: Python-compatible text representation of the notebook.
+    """
     lines = []
     for cell in nb.get('cells', []):
         cell_type = cell.get('cell_type', '')
         source = cell.get('source', [])
+        # Join the cell body once and transform it with C-level str ops
+        # instead of allocating two strings per source line.
+        body = ''.join(source).rstrip('\n')
         if cell_type == 'markdown':
             # Comment out markdown cells
             lines.append("# === Markdown Cell ===")
-            for line in source:
-                lines.append("# " + line.rstrip('\n'))
+            if body:
+                lines.append("# " + body.replace('\n', '\n# '))
             lines.append("")  # Blank line after cell
         elif cell_type == 'code':
             # Code cells: include the source code
             lines.append("# === Code Cell ===")
-            for line in source:
-                lines.append(line.rstrip('\n'))
+            if body:
+                lines.append(body)
             lines.append("")  # Blank line after cell
         else:
             # Indicate unsupported cell types
             lines.append(f"# === {cell_type.capitalize()} Cell (Unsupported) ===")
-            for line in source:
-                lines.append("# " + line.rstrip('\n'))
+            if body:
+                lines.append("# " + body.replace('\n', '\n# '))
             lines.append("")
 
     logger.debug("Successfully converted notebook to .py format.")
@@ -114,11 +298,17 @@ def should_include(
 
             include = should_include(file_path, ignore_spec, include_spec)
     """
-    logger.debug(f"Checking inclusion for path: {path}")
+    if ignore_spec is None and include_spec is None:
+        # No specifications provided; include everything. Returning before
+        # any logging keeps the no-.gitignore case (the common default)
+        # free of per-entry work.
+        return True
+
+    logger.debug("Checking inclusion for path: %s", path)
 
     # Normalize path to use forward slashes for consistent matching across OSes
     normalized_path = path.replace("\\", "/")
-    logger.debug(f"Normalized path for matching: {normalized_path}")
+    logger.debug("Normalized path for matching: %s", normalized_path)
 
     if include_spec and not ignore_spec:
         # Only include_spec is present
@@ -134,15 +324,401 @@ def should_include(
         # No specifications provided; include everything
         result = True
 
-    logger.debug(f"Path '{path}' inclusion result: {result}")
+    logger.debug("Path '%s' inclusion result: %s", path, result)
     return result
 
 
+# Chunk size for userspace file copies (1 MiB keeps syscall counts low
+# without holding large files in memory).
+_COPY_BUFFER_SIZE = 1 << 20
+
+# Buffer size for the output file; large enough that header and tree writes
+# coalesce into few syscalls.
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Section headers, pre-encoded once at import time.
+_DIR_STRUCTURE_HEADER = b"================\nDIRECTORY STRUCTURE\n================\n\n"
+_FILE_CONTENTS_HEADER = b"\n================\nFILE CONTENTS\n================\n\n"
+
+# Reader pipeline tuning: worker threads prefetch file contents while the
+# single writer drains them in order; the in-flight cap bounds memory.
+_READER_THREADS = 8
+_MAX_INFLIGHT = 32
+
+# Notebooks larger than this are stream-stripped on the writer thread
+# (O(one cell) memory) instead of being transformed in a reader thread.
+_STREAM_NB_THRESHOLD = 8 << 20
+
+# How many leading bytes to inspect when sniffing for binary content;
+# a NUL byte in the head marks a file as binary (same heuristic as
+# `grep -I` and git).
+_BINARY_SNIFF_BYTES = 8192
+
+# Sort key for DirEntry objects (C-level attribute access).
+_ENTRY_NAME = operator.attrgetter('name')
+
+# Byte-level probes for the common "already clean" notebook shape. When the
+# raw bytes contain no populated outputs array and no numeric
+# execution_count, stripping is a no-op and the JSON parse can be skipped
+# entirely. False positives (e.g. matching text inside a markdown cell) just
+# fall through to the full parse, so correctness is unaffected.
+_NB_POPULATED_OUTPUTS_RE = re.compile(rb'"outputs"\s*:\s*\[\s*[^\s\]]')
+_NB_EXEC_COUNT_RE = re.compile(rb'"execution_count"\s*:\s*\d')
+
+
+def _copy_file_contents(filepath: str, out) -> None:
+    """
+    Copy a file's raw bytes into the binary output stream.
+
+    Bytes are moved without passing through Python's text layer (no UTF-8
+    decode/re-encode). When the destination is a real file, `os.sendfile`
+    keeps the copy entirely inside the kernel; otherwise the copy falls back
+    to `shutil.copyfileobj` with a large buffer.
+
+    Args:
+        filepath (str): Path of the source file.
+        out: Binary writable file object for the output.
+    """
+    with open(filepath, 'rb') as src:
+        offset = 0
+        try:
+            out.flush()
+            out_fd = out.fileno()
+        except (AttributeError, OSError, ValueError):
+            out_fd = None
+
+        if out_fd is not None and hasattr(os, 'sendfile'):
+            try:
+                size = os.fstat(src.fileno()).st_size
+                while offset < size:
+                    sent = os.sendfile(out_fd, src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+            except OSError:
+                # Destination doesn't support sendfile; fall back below.
+                logger.debug("sendfile unavailable for '%s'; using buffered copy.", filepath)
+
+        src.seek(offset)
+        shutil.copyfileobj(src, out, _COPY_BUFFER_SIZE)
+
+
+def _prepare_file_payload(
+    filepath: str,
+    exclude_notebook_outputs: bool,
+    convert_notebook_to_py: bool
+):
+    """
+    Read one file — and transform notebooks — off the writer thread.
+
+    Runs inside the reader pool so disk latency and notebook JSON work
+    overlap with output writing. Large payloads are deferred to the writer
+    so prefetching never holds more than roughly one buffer per task.
+
+    Args:
+        filepath (str): Path of the file to prepare.
+        exclude_notebook_outputs (bool): Strip output cells from notebooks.
+        convert_notebook_to_py (bool): Convert notebooks to .py format.
+
+    Returns:
+        tuple: `(kind, data)` where `kind` is `'bytes'` (ready-to-write
+        bytes), `'path'` (large regular file the writer should copy
+        directly), or `'stream'` (large notebook the writer should
+        stream-strip).
+    """
+    ext = filepath[filepath.rfind('.'):]
+    handler = _PAYLOAD_HANDLERS.get(ext, _prepare_regular_payload)
+    return handler(filepath, exclude_notebook_outputs, convert_notebook_to_py)
+
+
+def _prepare_notebook_payload(
+    filepath: str,
+    exclude_notebook_outputs: bool,
+    convert_notebook_to_py: bool
+):
+    """
+    Prepare a Jupyter notebook payload (strip outputs / convert to .py).
+
+    Args:
+        filepath (str): Path of the notebook file.
+        exclude_notebook_outputs (bool): Strip output cells from notebooks.
+        convert_notebook_to_py (bool): Convert notebooks to .py format.
+
+    Returns:
+        tuple: `(kind, data)` payload as described in :func:`_prepare_file_payload`.
+    """
+    logger.debug("Handling Jupyter notebook: %s", filepath)
+    if (
+        ijson is not None
+        and exclude_notebook_outputs
+        and not convert_notebook_to_py
+        and os.path.getsize(filepath) > _STREAM_NB_THRESHOLD
+    ):
+        return ('stream', filepath)
+    # Read raw bytes: both orjson and stdlib json parse bytes directly, so
+    # the notebook never round-trips through Python's text layer here.
+    with open(filepath, 'rb') as f:
+        nb_bytes = f.read()
+    if not convert_notebook_to_py and not exclude_notebook_outputs:
+        logger.debug("Including notebook outputs.")
+        return ('bytes', nb_bytes)
+    if (
+        not convert_notebook_to_py
+        and not _NB_POPULATED_OUTPUTS_RE.search(nb_bytes)
+        and not _NB_EXEC_COUNT_RE.search(nb_bytes)
+    ):
+        # Clean notebook detected from the raw bytes: nothing to strip,
+        # so skip the parse and export the original bytes.
+        logger.debug("Notebook bytes show nothing to strip; exporting original text.")
+        return ('bytes', nb_bytes)
+    # Parse the notebook once and work on the dict directly: the old
+    # strip -> dumps -> parse -> convert chain serialized and re-parsed
+    # the same document for nothing.
+    try:
+        nb = _json_loads(nb_bytes)
+    except ValueError as e:
+        # UnicodeDecodeError and JSON decode errors both subclass ValueError
+        logger.warning(f"Failed to parse notebook '{filepath}'. Exporting original content.")
+        logger.debug(f"JSONDecodeError: {e}")
+        return ('bytes', nb_bytes)
+    changed = _strip_outputs_inplace(nb)
+    if convert_notebook_to_py:
+        logger.debug("Converting notebook to .py format.")
+        return ('bytes', _nb_dict_to_py(nb).encode('utf-8', errors='replace'))
+    if not changed:
+        # Already-clean notebook: skip the full re-serialization and export
+        # the original bytes untouched.
+        logger.debug("Notebook has no outputs to strip; exporting original text.")
+        return ('bytes', nb_bytes)
+    logger.debug("Stripping notebook outputs.")
+    return ('bytes', _json_dumps_indented(nb).encode('utf-8', errors='replace'))
+
+
+def _prepare_regular_payload(
+    filepath: str,
+    exclude_notebook_outputs: bool,
+    convert_notebook_to_py: bool
+):
+    """
+    Prepare a regular (non-notebook) file payload.
+
+    Small files are prefetched as bytes; large ones are left for the
+    writer's sendfile/copyfileobj path.
+
+    Args:
+        filepath (str): Path of the file.
+        exclude_notebook_outputs (bool): Unused; part of the handler signature.
+        convert_notebook_to_py (bool): Unused; part of the handler signature.
+
+    Returns:
+        tuple: `(kind, data)` payload as described in :func:`_prepare_file_payload`.
+    """
+    logger.debug("Reading regular file: %s", filepath)
+    size = os.stat(filepath).st_size
+    # Raw fd read: one open, reads sized from the stat, one close —
+    # no BufferedReader layer and no extra EOF-probing read syscall.
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        head = os.read(fd, _BINARY_SNIFF_BYTES) if size else b''
+        if b'\x00' in head:
+            # Binary payload: emit a placeholder instead of the raw bytes
+            logger.debug("Skipping binary file contents: %s", filepath)
+            return ('bytes', f"[Binary file {size} bytes]".encode('utf-8'))
+        if size > _COPY_BUFFER_SIZE:
+            return ('path', filepath)
+        chunks = [head]
+        remaining = size - len(head)
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return ('bytes', b''.join(chunks))
+    finally:
+        os.close(fd)
+
+
+# Extension-dispatch table for the hot payload loop: one dict lookup per
+# file routes to its handler; unknown extensions take the regular path.
+_PAYLOAD_HANDLERS = {
+    '.ipynb': _prepare_notebook_payload,
+}
+
+
+def _write_streamed_notebook(filepath: str, out) -> None:
+    """
+    Stream-strip a notebook into the binary output stream.
+
+    The stripped JSON is staged in a spooled temporary buffer and only
+    copied to `out` after the whole notebook has parsed. ijson can only
+    detect malformed JSON partway through the stream, so writing straight
+    into `out` would leave a partial stripped prefix in the export before
+    the fallback runs; staging keeps the fallback clean while the spool
+    bounds memory (it rolls over to disk past the buffer size).
+
+    Args:
+        filepath (str): Path of the notebook file.
+        out: Binary writable file object for the output.
+    """
+    with tempfile.SpooledTemporaryFile(
+        max_size=_OUTPUT_BUFFER_SIZE, mode='w+', encoding='utf-8'
+    ) as spool:
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            try:
+                stream_stripped_notebook(f, spool)
+            except ijson.JSONError as e:
+                logger.warning(
+                    f"Failed to stream-strip notebook '{filepath}': {e}. "
+                    "Falling back to original content."
+                )
+                # Nothing was written to `out`; pass the original bytes
+                # through verbatim, as strip_notebook_outputs does.
+                _copy_file_contents(filepath, out)
+                return
+        spool.seek(0)
+        while True:
+            chunk = spool.read(_COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            out.write(chunk.encode('utf-8', errors='replace'))
+
+
+def _make_inclusion_checker(
+    ignore_spec: Optional[PathSpec],
+    include_spec: Optional[PathSpec]
+):
+    """
+    Build a fast single-argument inclusion predicate for the given specs.
+
+    Resolves the spec combination once so hot loops avoid re-evaluating
+    :func:`should_include`'s branch ladder (and its per-call logging) for
+    every path. The returned callable mirrors `should_include` semantics.
+
+    Args:
+        ignore_spec (Optional[PathSpec]): Spec for ignored patterns.
+        include_spec (Optional[PathSpec]): Spec for included patterns.
+
+    Returns:
+        Callable[[str], bool]: Predicate returning True if the path is included.
+    """
+    match_include = _spec_matcher(include_spec) if include_spec else None
+    match_ignore = _spec_matcher(ignore_spec) if ignore_spec else None
+
+    if match_include and not match_ignore:
+        return lambda path: bool(match_include(_normalize_match_path(path)))
+    if match_ignore and not match_include:
+        return lambda path: not match_ignore(_normalize_match_path(path))
+    if match_include and match_ignore:
+        def _check(path: str) -> bool:
+            normalized = _normalize_match_path(path)
+            return bool(match_include(normalized)) or not match_ignore(normalized)
+        return _check
+    return lambda path: True
+
+
+def _make_cached_inclusion_checker(
+    ignore_spec: Optional[PathSpec],
+    include_spec: Optional[PathSpec]
+):
+    """
+    Build an inclusion predicate memoized on the path string.
+
+    The structure pass probes the same files repeatedly (once per ancestor
+    directory via :func:`has_included_content`, then again when the file's
+    own directory is listed), re-running identical pattern matches each
+    time. The memo dict lives for one export, so results are collected per
+    run and discarded with it.
+
+    Args:
+        ignore_spec (Optional[PathSpec]): Spec for ignored patterns.
+        include_spec (Optional[PathSpec]): Spec for included patterns.
+
+    Returns:
+        Callable[[str], bool]: Memoized predicate returning True if the path
+        is included.
+    """
+    raw_included = _make_inclusion_checker(ignore_spec, include_spec)
+    if ignore_spec is None and include_spec is None:
+        # Nothing to match: the raw checker is a constant True, so caching
+        # it would only grow a dict of every path seen.
+        return raw_included
+    cache: dict = {}
+
+    def _cached(path: str) -> bool:
+        result = cache.get(path)
+        if result is None:
+            result = raw_included(path)
+            cache[path] = result
+        return result
+
+    return _cached
+
+
+def _normalize_match_path(path: str) -> str:
+    """
+    Normalize a path the way PathSpec does before regex matching.
+
+    Args:
+        path (str): The file or directory path.
+
+    Returns:
+        str: Path with forward slashes and no leading './'.
+    """
+    normalized = path.replace("\\", "/")
+    if normalized.startswith("./"):
+        normalized = normalized[2:]
+    return normalized
+
+
+def _spec_matcher(spec: PathSpec):
+    """
+    Return the fastest available boolean matcher for a spec.
+
+    Prefers the fused single-regex form from :func:`build_fused_regex`.
+    Specs with negation patterns fall back to the run-fused matcher from
+    :func:`build_fused_matcher`, and only an empty spec falls all the way
+    back to `PathSpec.match_file`.
+
+    Args:
+        spec (PathSpec): Compiled path specification.
+
+    Returns:
+        Callable[[str], bool]: Matcher taking a normalized path.
+    """
+    fused = build_fused_regex(spec)
+    if fused is None:
+        run_matcher = build_fused_matcher(spec)
+        return run_matcher if run_matcher is not None else spec.match_file
+
+    match = fused.match
+    tables = build_fast_match_tables(spec)
+    if tables is None or tables == ((), frozenset()):
+        return lambda path: match(path) is not None
+
+    suffixes, literals = tables
+
+    def _match(path: str) -> bool:
+        # Literal fast paths: cheap positive short-circuits before the
+        # fused regex; a miss still falls through to the full match.
+        if suffixes and path.endswith(suffixes):
+            return True
+        if literals and path.rsplit('/', 1)[-1] in literals:
+            return True
+        return match(path) is not None
+
+    return _match
+
+
 def has_included_content(
     dir_path: str,
     ignore_spec: Optional[PathSpec],
     include_spec: Optional[PathSpec],
-    exclude_files: Optional[Set[str]]
+    exclude_files: Optional[Set[str]],
+    file_included=None,
+    dir_cache: Optional[dict] = None
 ) -> bool:
     """
     Recursively check if 'dir_path' contains at least one file (or subdirectory)
@@ -156,59 +732,193 @@ def has_included_content(
         ignore_spec (Optional[PathSpec]): Spec for ignored patterns.
         include_spec (Optional[PathSpec]): Spec for included patterns.
         exclude_files (Optional[Set[str]]): Set of absolute file paths to exclude.
+        file_included (Optional[Callable[[str], bool]]): Precomputed (possibly
+            memoized) inclusion predicate; built from the specs when not supplied.
+        dir_cache (Optional[dict]): Per-traversal memo of directory results.
+            The tree pass probes each directory once per ancestor level; the
+            cache collapses those repeated subtree scans to one.
 
     Returns:
         bool: True if the directory contains included content, False otherwise.
     """
-    # If the directory is ignored but not re-included by the include spec, skip it
-    if ignore_spec and ignore_spec.match_file(dir_path):
-        if not (include_spec and include_spec.match_file(dir_path)):
+    if file_included is None:
+        file_included = _make_inclusion_checker(ignore_spec, include_spec)
+
+    if dir_cache is not None:
+        cached = dir_cache.get(dir_path)
+        if cached is not None:
+            return cached
+
+    result = _probe_included_content(
+        dir_path, ignore_spec, include_spec, exclude_files, file_included, dir_cache
+    )
+    if dir_cache is not None:
+        dir_cache[dir_path] = result
+    return result
+
+
+def _probe_included_content(
+    dir_path: str,
+    ignore_spec: Optional[PathSpec],
+    include_spec: Optional[PathSpec],
+    exclude_files: Optional[Set[str]],
+    file_included,
+    dir_cache: Optional[dict]
+) -> bool:
+    """
+    Uncached body of :func:`has_included_content`.
+
+    Args:
+        dir_path (str): The directory path to check.
+        ignore_spec (Optional[PathSpec]): Spec for ignored patterns.
+        include_spec (Optional[PathSpec]): Spec for included patterns.
+        exclude_files (Optional[Set[str]]): Set of absolute file paths to exclude.
+        file_included (Callable[[str], bool]): Inclusion predicate.
+        dir_cache (Optional[dict]): Memo threaded through the recursion.
+
+    Returns:
+        bool: True if the directory contains included content, False otherwise.
+    """
+    # If the directory is ignored but not re-included by the include spec, skip it.
+    # Match with a trailing slash so directory-only patterns ('build/') prune
+    # the whole subtree here instead of matching its files one by one below;
+    # the slashed form matches everywhere the bare path does, plus those.
+    dir_match_path = dir_path if dir_path.endswith('/') else dir_path + '/'
+    if ignore_spec and ignore_spec.match_file(dir_match_path):
+        if not (include_spec and include_spec.match_file(dir_match_path)):
             logger.debug(
-                f"Directory '{dir_path}' is explicitly ignored and not rescued by include spec."
+                "Directory '%s' is explicitly ignored and not rescued by include spec.",
+                dir_path
             )
             return False
         else:
             logger.debug(
-                f"Directory '{dir_path}' is matched by ignore spec but rescued by include spec."
+                "Directory '%s' is matched by ignore spec but rescued by include spec.",
+                dir_path
             )
 
     try:
-        entries = os.listdir(dir_path)
+        entries = os.scandir(dir_path)
     except PermissionError:
         logger.warning(f"Permission denied accessing directory: {dir_path}")
         return False
 
-    for entry in entries:
-        path = os.path.join(dir_path, entry)
-        abs_path = os.path.abspath(path)
-
-        if os.path.isdir(path):
-            # Recurse into subdirectories
-            if has_included_content(path, ignore_spec, include_spec, exclude_files):
-                return True
-        else:
-            # Skip excluded files
-            if exclude_files and abs_path in exclude_files:
-                continue
+    # scandir's DirEntry carries the joined path and cached type, so the
+    # loop below does no per-entry os.path.join or stat work.
+    abs_dir = None
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                # Recurse into subdirectories
+                if has_included_content(
+                    entry.path, ignore_spec, include_spec, exclude_files,
+                    file_included, dir_cache
+                ):
+                    return True
+            else:
+                # Skip excluded files
+                if exclude_files:
+                    if abs_dir is None:
+                        abs_dir = os.path.abspath(dir_path)
+                    if abs_dir + os.sep + entry.name in exclude_files:
+                        continue
 
-            # Check if the file is included
-            if should_include(path, ignore_spec, include_spec):
-                return True
+                # Check if the file is included
+                if file_included(entry.path):
+                    return True
 
-    logger.debug(f"No included content found in directory: {dir_path}")
+    logger.debug("No included content found in directory: %s", dir_path)
     return False
 
 
+def _scan_tree_entries(
+    dir_path: str,
+    ignore_spec: Optional[PathSpec],
+    include_spec: Optional[PathSpec],
+    exclude_files: Optional[Set[str]],
+    file_included=None,
+    stable_order: bool = True,
+    dir_cache: Optional[dict] = None
+):
+    """
+    List one directory level for the tree view, filtered and display-ordered.
+
+    Uses `os.scandir` so each entry's type comes from the directory read
+    itself (`DirEntry.is_dir` is cached), avoiding an extra stat per entry.
+
+    Args:
+        dir_path (str): The directory to list.
+        ignore_spec (Optional[PathSpec]): Spec for ignored patterns.
+        include_spec (Optional[PathSpec]): Spec for included patterns.
+        exclude_files (Optional[Set[str]]): Set of absolute file paths to exclude.
+        file_included (Optional[Callable[[str], bool]]): Precomputed inclusion
+            predicate; built from the specs when not supplied.
+        stable_order (bool, optional): Sort entries alphabetically for
+            deterministic output. Pass False to keep the raw directory order
+            and skip the per-directory sort. Defaults to True.
+        dir_cache (Optional[dict]): Per-traversal memo passed down to
+            :func:`has_included_content`. Defaults to None.
+
+    Returns:
+        Optional[list]: Sorted (directories first) list of `(name, path, is_dir)`
+        tuples, or None if the directory could not be read.
+    """
+    if file_included is None:
+        file_included = _make_inclusion_checker(ignore_spec, include_spec)
+    logger.debug("Listing directory: %s", dir_path)
+    try:
+        with os.scandir(dir_path) as it:
+            # Sorting DirEntry objects directly (attrgetter key) avoids
+            # re-statting or rebuilding path strings for the sort.
+            all_entries = sorted(it, key=_ENTRY_NAME) if stable_order else list(it)
+    except PermissionError:
+        logger.warning(f"Permission denied accessing directory: {dir_path}")
+        return None
+
+    dirs = []
+    files = []
+    # Resolve the directory's absolute path at most once; per-entry
+    # os.path.abspath calls re-run getcwd + normalization every time.
+    abs_dir = None
+    for entry in all_entries:
+        if entry.is_dir(follow_symlinks=False):
+            # Only include the directory if it has included content
+            if has_included_content(
+                entry.path, ignore_spec, include_spec, exclude_files,
+                file_included, dir_cache
+            ):
+                dirs.append((entry.name, entry.path, True))
+        else:
+            if exclude_files:
+                if abs_dir is None:
+                    abs_dir = os.path.abspath(dir_path)
+                abs_path = abs_dir + os.sep + entry.name
+                if abs_path in exclude_files:
+                    logger.debug("Excluding file from structure: %s", abs_path)
+                    continue
+            if file_included(entry.path):
+                files.append((entry.name, entry.path, False))
+
+    # Directories first, then files, each alphabetically — same display
+    # order the recursive implementation produced.
+    return dirs + files
+
+
 def print_structure(
     root_dir: str = '.',
     out: Optional[TextIO] = None,
     prefix: str = '',
     ignore_spec: Optional[PathSpec] = None,
     include_spec: Optional[PathSpec] = None,
-    exclude_files: Optional[Set[str]] = None
+    exclude_files: Optional[Set[str]] = None,
+    collect_files: Optional[list] = None,
+    stable_order: bool = True
 ) -> None:
     """
-    Recursively print a "tree" structure of directories and files.
+    Print a "tree" structure of directories and files.
+
+    The traversal is iterative (an explicit stack of directory frames) and
+    uses `os.scandir`, so no stat syscall or Python frame is spent per entry.
 
     This function will:
       - Skip directories only if they're explicitly matched by ignore_spec (and not rescued by include_spec).
@@ -223,6 +933,13 @@ def print_structure(
         ignore_spec (Optional[PathSpec], optional): Spec for ignored patterns. Defaults to None.
         include_spec (Optional[PathSpec], optional): Spec for included patterns. Defaults to None.
         exclude_files (Optional[Set[str]], optional): Set of absolute file paths to exclude. Defaults to None.
+        collect_files (Optional[list], optional): When given, every included file
+            path is appended to this list in display order, letting the caller
+            reuse the traversal instead of walking the tree a second time.
+            Defaults to None.
+        stable_order (bool, optional): Sort each directory alphabetically for
+            deterministic output; False skips the sorts on huge trees where
+            ordering doesn't matter. Defaults to True.
 
     Example:
         .. code-block:: python
@@ -233,60 +950,99 @@ def print_structure(
         import sys
         out = sys.stdout
 
-    logger.debug(f"Listing directory: {root_dir}")
-    try:
-        all_entries = sorted(os.listdir(root_dir))
-    except PermissionError:
-        logger.warning(f"Permission denied accessing directory: {root_dir}")
-        out.write(prefix + "└── [Permission Denied]\n")
-        return
+    # writelines consumes the generator lazily, so only one directory's
+    # entries per tree level are ever held in memory.
+    out.writelines(iter_tree_lines(
+        root_dir,
+        prefix=prefix,
+        ignore_spec=ignore_spec,
+        include_spec=include_spec,
+        exclude_files=exclude_files,
+        collect_files=collect_files,
+        stable_order=stable_order
+    ))
 
-    # Separate directories from files to handle them differently
-    dirs = []
-    files = []
-    for entry in all_entries:
-        path = os.path.join(root_dir, entry)
-        abs_path = os.path.abspath(path)
 
-        # Handle directories
-        if os.path.isdir(path):
-            # Only include the directory if it has included content
-            if has_included_content(path, ignore_spec, include_spec, exclude_files):
-                dirs.append(entry)
-        else:
-            # Handle files
-            if exclude_files and abs_path in exclude_files:
-                logger.debug(f"Excluding file from structure: {abs_path}")
-                continue
-            if should_include(path, ignore_spec, include_spec):
-                files.append(entry)
-
-    # Combine directories and files, sorted alphabetically
-    combined = sorted(dirs) + sorted(files)
-
-    for i, entry in enumerate(combined):
-        path = os.path.join(root_dir, entry)
-        is_last = (i == len(combined) - 1)
+def iter_tree_lines(
+    root_dir: str = '.',
+    prefix: str = '',
+    ignore_spec: Optional[PathSpec] = None,
+    include_spec: Optional[PathSpec] = None,
+    exclude_files: Optional[Set[str]] = None,
+    collect_files: Optional[list] = None,
+    stable_order: bool = True
+):
+    """
+    Yield the tree-view lines one at a time instead of writing them.
+
+    Streaming keeps memory at O(depth): the explicit stack holds one
+    directory's entry list per tree level, and consumers (`writelines`)
+    batch the lines at the I/O-buffer level.
+
+    Args:
+        root_dir (str, optional): The directory to walk. Defaults to '.'.
+        prefix (str, optional): Prefix string for the top level. Defaults to ''.
+        ignore_spec (Optional[PathSpec], optional): Spec for ignored patterns. Defaults to None.
+        include_spec (Optional[PathSpec], optional): Spec for included patterns. Defaults to None.
+        exclude_files (Optional[Set[str]], optional): Set of absolute file paths to exclude. Defaults to None.
+        collect_files (Optional[list], optional): When given, included file paths
+            are appended in display order. Defaults to None.
+        stable_order (bool, optional): Sort entries alphabetically. Defaults to True.
+
+    Yields:
+        str: One tree line at a time, newline-terminated.
+    """
+    # Memoized for the lifetime of this traversal: the same file paths are
+    # probed repeatedly while testing ancestor directories for content, and
+    # the same directories are probed once per ancestor level.
+    file_included = _make_cached_inclusion_checker(ignore_spec, include_spec)
+    dir_cache: dict = {}
+
+    # Explicit stack of (entries, next_index, prefix) frames instead of
+    # recursion; `entries` is None when the directory could not be listed.
+    stack = [(
+        _scan_tree_entries(
+            root_dir, ignore_spec, include_spec, exclude_files, file_included,
+            stable_order, dir_cache
+        ),
+        0,
+        prefix
+    )]
+
+    while stack:
+        entries, i, cur_prefix = stack.pop()
+
+        if entries is None:
+            yield cur_prefix + "└── [Permission Denied]\n"
+            continue
+        if i >= len(entries):
+            continue
+
+        name, path, is_dir = entries[i]
+        is_last = (i == len(entries) - 1)
         connector = '└── ' if is_last else '├── '
 
-        out.write(prefix + connector + entry)
-        logger.debug(f"Added to structure: {path}")
-
-        if entry in dirs:
-            out.write("/\n")
-            # Update the prefix for child entries
-            new_prefix = prefix + ("    " if is_last else "│   ")
-            print_structure(
-                path,
-                out=out,
-                prefix=new_prefix,
-                ignore_spec=ignore_spec,
-                include_spec=include_spec,
-                exclude_files=exclude_files
-            )
+        logger.debug("Added to structure: %s", path)
+
+        # Re-push the current frame so remaining siblings resume after
+        # the subtree below (depth-first, same order as the recursion).
+        stack.append((entries, i + 1, cur_prefix))
+
+        if is_dir:
+            yield cur_prefix + connector + name + "/\n"
+            new_prefix = cur_prefix + ("    " if is_last else "│   ")
+            stack.append((
+                _scan_tree_entries(
+                    path, ignore_spec, include_spec, exclude_files, file_included,
+                    stable_order, dir_cache
+                ),
+                0,
+                new_prefix
+            ))
         else:
-            # It's a file, just finish the line
-            out.write("\n")
+            yield cur_prefix + connector + name + "\n"
+            if collect_files is not None:
+                collect_files.append(path)
 
 
 def export_folder_contents(
@@ -295,7 +1051,8 @@ def export_folder_contents(
     ignore_file: Optional[str] = '.gitignore',
     include_file: Optional[str] = None,
     exclude_notebook_outputs: bool = True,
-    convert_notebook_to_py: bool = False
+    convert_notebook_to_py: bool = False,
+    stable_order: bool = True
 ) -> None:
     """
     Export the contents of a folder into a single text file while respecting
@@ -308,6 +1065,8 @@ def export_folder_contents(
         include_file (Optional[str], optional): Path to the include file. Defaults to None.
         exclude_notebook_outputs (bool, optional): If True, excludes output cells from .ipynb files. Defaults to True.
         convert_notebook_to_py (bool, optional): If True, converts .ipynb files to .py format. Defaults to False.
+        stable_order (bool, optional): Sort directory entries for deterministic
+            (diffable) output; False skips the per-directory sorts. Defaults to True.
 
     Raises:
         IOError: If an I/O error occurs during file operations.
@@ -368,96 +1127,84 @@ def export_folder_contents(
         logger.debug(f"Excluding include file from structure: {os.path.abspath(include_file)}")
 
     try:
-        with open(output_file, 'w', encoding='utf-8', errors='replace') as out:
+        with open(output_file, 'wb', buffering=_OUTPUT_BUFFER_SIZE) as out:
             logger.debug(f"Opened output file '{output_file}' for writing.")
 
             # 1) Print the directory structure
-            out.write("================\n")
-            out.write("DIRECTORY STRUCTURE\n")
-            out.write("================\n\n")
+            out.write(_DIR_STRUCTURE_HEADER)
             logger.debug("Writing directory structure header.")
 
-            print_structure(
-                root_dir,
-                out=out,
-                ignore_spec=ignore_spec,
-                include_spec=include_spec,
-                exclude_files=exclude_files
+            # Collect the included files during the structure pass so the
+            # contents pass below reuses the traversal instead of re-walking
+            # (and re-matching) the whole tree. Lines stream straight into
+            # the buffered output, so the tree is never held in memory.
+            included_files: list = []
+            out.writelines(
+                line.encode('utf-8', errors='replace')
+                for line in iter_tree_lines(
+                    root_dir,
+                    ignore_spec=ignore_spec,
+                    include_spec=include_spec,
+                    exclude_files=exclude_files,
+                    collect_files=included_files,
+                    stable_order=stable_order
+                )
             )
             logger.debug("Directory structure printed successfully.")
 
-            out.write("\n")
             # 2) Print the file contents
-            out.write("================\n")
-            out.write("FILE CONTENTS\n")
-            out.write("================\n\n")
+            out.write(_FILE_CONTENTS_HEADER)
             logger.debug("Writing file contents header.")
 
-            # Walk the directory tree, but only prune directories explicitly ignored
-            for root, dirs, files in os.walk(root_dir):
-                # 1) Prune directories that are explicitly matched by the ignore spec
-                if ignore_spec:
-                    dirs[:] = [
-                        d for d in dirs
-                        if not ignore_spec.match_file(os.path.join(root, d))
-                    ]
-
-                logger.debug(f"Walking through directory: {root}")
-
-                # 2) Handle each file, applying full should_include
-                for filename in files:
-                    filepath = os.path.join(root, filename)
-                    abs_filepath = os.path.abspath(filepath)
-
-                    # Skip if it's the ignore or include file
-                    if abs_filepath in exclude_files:
-                        logger.debug(f"Skipping special file: {abs_filepath}")
-                        continue
-
-                    # Now do a normal should_include check for files
-                    if not should_include(filepath, ignore_spec, include_spec):
-                        logger.debug(f"Excluding file based on patterns: {filepath}")
-                        continue
+            # Emit the contents of the files gathered during the structure
+            # pass; inclusion and exclusion were already applied there.
+            # Reader threads prefetch (and transform) upcoming files while
+            # the writer drains completed payloads in deterministic order.
+            with ThreadPoolExecutor(max_workers=_READER_THREADS) as executor:
+                pending: deque = deque()
+                path_iter = iter(included_files)
+
+                def _submit_next() -> None:
+                    for next_path in path_iter:
+                        pending.append((next_path, executor.submit(
+                            _prepare_file_payload,
+                            next_path,
+                            exclude_notebook_outputs,
+                            convert_notebook_to_py
+                        )))
+                        return
+
+                # Prime the pipeline up to the in-flight cap
+                for _ in range(_MAX_INFLIGHT):
+                    _submit_next()
+
+                while pending:
+                    filepath, future = pending.popleft()
+                    _submit_next()
 
                     relpath = os.path.relpath(filepath, start=root_dir)
-                    logger.debug(f"Processing file: {filepath} (Relative path: {relpath})")
+                    logger.debug("Processing file: %s (Relative path: %s)", filepath, relpath)
 
                     # Print a header for this file's contents
-                    out.write(f"==={relpath}===\n")
+                    out.write(f"==={relpath}===\n".encode('utf-8', errors='replace'))
 
                     # Write the file content
                     try:
-                        if filename.endswith('.ipynb'):
-                            logger.debug(f"Handling Jupyter notebook: {filepath}")
-                            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                                nb_content = f.read()
-                            if convert_notebook_to_py:
-                                logger.debug("Converting notebook to .py format.")
-                                # When converting to .py, always strip outputs
-                                stripped_content = strip_notebook_outputs(nb_content)
-                                py_content = convert_nb_to_py(stripped_content)
-                                out.write(py_content)
-                            else:
-                                if exclude_notebook_outputs:
-                                    logger.debug("Stripping notebook outputs.")
-                                    # Exclude outputs by stripping them
-                                    stripped_content = strip_notebook_outputs(nb_content)
-                                    out.write(stripped_content)
-                                else:
-                                    logger.debug("Including notebook outputs.")
-                                    # Include original notebook content with outputs
-                                    out.write(nb_content)
+                        kind, data = future.result()
+                        if kind == 'bytes':
+                            out.write(data)
+                        elif kind == 'path':
+                            # Large regular file: raw byte passthrough
+                            _copy_file_contents(data, out)
                         else:
-                            # Regular file
-                            logger.debug(f"Reading regular file: {filepath}")
-                            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                                out.write(f.read())
+                            # Large notebook: stream-strip with ~one cell in memory
+                            _write_streamed_notebook(data, out)
                     except Exception as e:
                         logger.error(f"Failed to read file '{filepath}': {e}")
-                        out.write(f"[Non-text or unreadable content: {e}]")
+                        out.write(f"[Non-text or unreadable content: {e}]".encode('utf-8', errors='replace'))
 
                     # Blank line after each file
-                    out.write("\n\n")
+                    out.write(b"\n\n")
     except IOError as e:
         logger.exception(f"Failed to write to output file '{output_file}': {e}")
         raise
@@ -1,9 +1,144 @@
 # my_exporter/ignore_handler.py
 
+import re
+from typing import Optional
+
 from pathspec import PathSpec
 from .logger import logger  # <-- Import the logger
 
 
+def build_fused_regex(spec: PathSpec) -> Optional[re.Pattern]:
+    """
+    Fuse all of a spec's pattern regexes into a single compiled alternation.
+
+    `PathSpec.match_file` loops over every compiled pattern per path; fusing
+    them into one regex lets the C regex engine test all patterns in a single
+    pass. Only safe when the spec contains no negation (`!`) patterns, whose
+    last-match-wins semantics an alternation cannot express.
+
+    Args:
+        spec (PathSpec): Compiled path specification to fuse.
+
+    Returns:
+        Optional[re.Pattern]: The fused pattern, or None when the spec is empty
+        or contains negation patterns (callers should fall back to the spec).
+    """
+    parts = []
+    for pat in spec.patterns:
+        if pat.regex is None:
+            # Blank/comment lines compile to no regex
+            continue
+        if not pat.include:
+            logger.debug("Spec contains negation patterns; skipping regex fusion.")
+            return None
+        # Drop named groups (e.g. (?P<ps_d>...)) so patterns can coexist
+        # inside one alternation; only the boolean match result is needed.
+        parts.append(re.sub(r'\(\?P<[^>]+>', '(?:', pat.regex.pattern))
+
+    if not parts:
+        return None
+
+    fused = re.compile('|'.join(f'(?:{p})' for p in parts))
+    logger.debug(f"Fused {len(parts)} patterns into a single regex.")
+    return fused
+
+
+def build_fused_matcher(spec: PathSpec):
+    """
+    Build a boolean matcher that fuses runs of same-sign patterns.
+
+    Complements :func:`build_fused_regex` for specs containing negation
+    (`!`) patterns. A single alternation cannot express last-match-wins, but
+    consecutive patterns with the same sign can still be fused: the spec
+    collapses into an ordered list of `(include, fused_regex)` runs, and
+    scanning the runs from last to first for the first hit reproduces
+    gitignore's last-match-wins semantics exactly. A spec with a handful of
+    negations thus costs a few regex passes per path instead of one per
+    pattern.
+
+    Args:
+        spec (PathSpec): Compiled path specification to fuse.
+
+    Returns:
+        Optional[Callable[[str], bool]]: Matcher taking a normalized path,
+        or None when the spec compiles to no patterns.
+    """
+    runs = []  # ordered [include_flag, regex_parts] groups
+    for pat in spec.patterns:
+        if pat.regex is None:
+            # Blank/comment lines compile to no regex
+            continue
+        cleaned = re.sub(r'\(\?P<[^>]+>', '(?:', pat.regex.pattern)
+        if runs and runs[-1][0] == pat.include:
+            runs[-1][1].append(cleaned)
+        else:
+            runs.append([pat.include, [cleaned]])
+
+    if not runs:
+        return None
+
+    compiled = [
+        (include, re.compile('|'.join(f'(?:{p})' for p in parts)))
+        for include, parts in runs
+    ]
+    # Later patterns win, so probe the runs back to front.
+    compiled.reverse()
+    logger.debug(f"Fused spec into {len(compiled)} run(s) of same-sign patterns.")
+
+    def _match(path: str) -> bool:
+        for include, regex in compiled:
+            if regex.match(path):
+                return include
+        return False
+
+    return _match
+
+
+# Characters that make a gitignore pattern non-literal
+_GLOB_CHARS = frozenset('*?[]!')
+
+
+def build_fast_match_tables(spec: PathSpec):
+    """
+    Extract literal fast paths from a spec for O(1) positive matching.
+
+    Many real-world gitignore entries are plain literals (`ignore_me.txt`)
+    or simple extension globs (`*.log`). These can be decided with a single
+    `str.endswith`/set lookup instead of a regex pass. The returned tables
+    are *positive short-circuits only*: a miss proves nothing, and callers
+    must still fall back to the full (or fused) spec match, which keeps
+    directory-content semantics intact.
+
+    Args:
+        spec (PathSpec): Compiled path specification to analyze.
+
+    Returns:
+        Optional[tuple]: `(suffixes, literals)` where `suffixes` is a tuple of
+        extension suffixes (e.g. `'.log'`) and `literals` a frozenset of bare
+        file names, or None when the spec contains negation patterns.
+    """
+    suffixes = []
+    literals = set()
+    for pat in spec.patterns:
+        if pat.regex is None:
+            continue
+        if not pat.include:
+            logger.debug("Spec contains negation patterns; skipping fast-path tables.")
+            return None
+        text = pat.pattern
+        if text.startswith('*.') and '/' not in text and not _GLOB_CHARS & set(text[1:]):
+            # '*.ext' — any path ending with '.ext' is matched
+            suffixes.append(text[1:])
+        elif '/' not in text and not text.endswith('/') and not _GLOB_CHARS & set(text):
+            # bare literal — matches a file of that name at any depth
+            literals.add(text)
+
+    logger.debug(
+        f"Fast-path tables: {len(suffixes)} suffix(es), {len(literals)} literal(s)."
+    )
+    return tuple(suffixes), frozenset(literals)
+
+
 def load_ignore_patterns(ignore_file: str = '.gitignore') -> PathSpec:
     """
     Load ignore patterns from the specified ignore file.
@@ -2,168 +2,218 @@
 
 import unittest
 import os
+import re
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson  # Optional fast JSON serializer, same fallback as the exporter
+except ImportError:
+    orjson = None
+
 from my_exporter import export_folder_contents
+from my_exporter.exporter import strip_notebook_outputs
+
+# Fixture file contents, pre-encoded once at import time so setUpClass can
+# write them with a single write_bytes call per file (no per-file text-mode
+# wrapper or encode pass).
+_INCLUDE_BYTES = b'This file should be included.'
+_IGNORE_BYTES = b'This file should be ignored.'
+_GITIGNORE_BYTES = b'ignore_me.txt\n'
+_INCLUDE_PATTERNS_BYTES = b'include_me.txt\n'
+
+# Sample Jupyter notebook with a code cell and output. The dict and its
+# serialized form are constant across tests, so both are built once here.
+_NB_CONTENT = {
+    "cells": [
+        {
+            "cell_type": "markdown",
+            "metadata": {},
+            "source": ["# This is a markdown cell"]
+        },
+        {
+            "cell_type": "code",
+            "metadata": {},
+            "execution_count": 1,
+            "source": ["print('Hello World')"],
+            "outputs": [
+                {
+                    "name": "stdout",
+                    "output_type": "stream",
+                    "text": ["Hello World\n"]
+                }
+            ]
+        }
+    ],
+    "metadata": {},
+    "nbformat": 4,
+    "nbformat_minor": 5
+}
+
+if orjson is not None:
+    _NB_JSON_BYTES = orjson.dumps(_NB_CONTENT, option=orjson.OPT_INDENT_2)
+else:
+    _NB_JSON_BYTES = json.dumps(_NB_CONTENT, indent=2).encode('utf-8')
+
+# Canonical stripped form of the notebook, computed once with the same
+# serializer the exporter uses so the expected bytes stay valid whichever
+# optional JSON backend is installed. A single whole-blob containment check
+# replaces (and strengthens) a series of per-substring probes.
+_STRIPPED_NB_BYTES = strip_notebook_outputs(_NB_JSON_BYTES.decode('utf-8')).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _needle_pattern(needles):
+    """
+    Compile an alternation of escaped needles, once per distinct set.
+
+    Alternatives are tried left to right, so needles are sorted longest
+    first — otherwise a needle that is a prefix of another would always
+    win and mask the longer one from finditer.
+    """
+    ordered = sorted(needles, key=len, reverse=True)
+    return re.compile(b'|'.join(map(re.escape, ordered)))
 
 
 class TestExporter(unittest.TestCase):
-    def setUp(self):
-        # Setup a temporary directory structure for testing
-        self.test_dir = 'test_project'
-        os.makedirs(self.test_dir, exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        # Setup a temporary directory structure for testing. The tests only
+        # read the fixture tree, so it is built once for the whole class
+        # instead of once per test method. A real temp dir (tmpfs on most
+        # Linux setups) keeps the fixture out of the working directory, so
+        # concurrent runs can't collide on a shared 'test_project' path.
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.test_dir = os.path.join(cls._tmp.name, 'project')
+        os.makedirs(cls.test_dir)
+        # Output files go next to (not inside) the fixture tree so exports
+        # never pick up another test's output, and cleanup sweeps them all.
+        cls.out_dir = os.path.join(cls._tmp.name, 'outputs')
+        os.makedirs(cls.out_dir)
 
         # Create a regular text file to include
-        with open(os.path.join(self.test_dir, 'include_me.txt'), 'w', encoding='utf-8') as f:
-            f.write('This file should be included.')
+        Path(cls.test_dir, 'include_me.txt').write_bytes(_INCLUDE_BYTES)
 
         # Create a file that should be ignored via .gitignore
-        with open(os.path.join(self.test_dir, 'ignore_me.txt'), 'w', encoding='utf-8') as f:
-            f.write('This file should be ignored.')
+        Path(cls.test_dir, 'ignore_me.txt').write_bytes(_IGNORE_BYTES)
 
         # Create a .gitignore file
-        with open(os.path.join(self.test_dir, '.gitignore'), 'w', encoding='utf-8') as f:
-            f.write('ignore_me.txt\n')
+        Path(cls.test_dir, '.gitignore').write_bytes(_GITIGNORE_BYTES)
 
         # Create an include patterns file
-        with open(os.path.join(self.test_dir, 'include_patterns.txt'), 'w', encoding='utf-8') as f:
-            f.write('include_me.txt\n')
-
-        # Create a sample Jupyter notebook with a code cell and output
-        nb_content = {
-            "cells": [
-                {
-                    "cell_type": "markdown",
-                    "metadata": {},
-                    "source": ["# This is a markdown cell"]
-                },
-                {
-                    "cell_type": "code",
-                    "metadata": {},
-                    "execution_count": 1,
-                    "source": ["print('Hello World')"],
-                    "outputs": [
-                        {
-                            "name": "stdout",
-                            "output_type": "stream",
-                            "text": ["Hello World\n"]
-                        }
-                    ]
-                }
-            ],
-            "metadata": {},
-            "nbformat": 4,
-            "nbformat_minor": 5
+        Path(cls.test_dir, 'include_patterns.txt').write_bytes(_INCLUDE_PATTERNS_BYTES)
+
+        # Write the pre-serialized sample notebook
+        Path(cls.test_dir, 'test_notebook.ipynb').write_bytes(_NB_JSON_BYTES)
+
+        # Run each distinct export configuration once and cache its output;
+        # tests only assert on the cached contents. 'ignore_only' is shared
+        # by test_only_ignore_file and test_notebook_exclude_outputs, which
+        # pass identical arguments, so six tests need five exports.
+        gitignore = os.path.join(cls.test_dir, '.gitignore')
+        include_patterns = os.path.join(cls.test_dir, 'include_patterns.txt')
+        export_cases = {
+            'include_only': {'ignore_file': None, 'include_file': include_patterns},
+            'ignore_only': {'ignore_file': gitignore},
+            'both': {'ignore_file': gitignore, 'include_file': include_patterns},
+            'nb_include': {'ignore_file': gitignore, 'exclude_notebook_outputs': False},
+            'nb_py': {'ignore_file': gitignore, 'convert_notebook_to_py': True},
         }
-
-        with open(os.path.join(self.test_dir, 'test_notebook.ipynb'), 'w', encoding='utf-8') as f:
-            json.dump(nb_content, f, indent=2)
-
-    def tearDown(self):
-        # Remove the temporary directory after tests
-        import shutil
-        shutil.rmtree(self.test_dir)
+        def _run_export(key, kwargs):
+            output_file = os.path.join(cls.out_dir, f'output_{key}.txt')
+            export_folder_contents(
+                root_dir=cls.test_dir,
+                output_file=output_file,
+                **kwargs
+            )
+            # Keep the output as raw bytes: every asserted needle is ASCII,
+            # so substring checks work directly on the bytes and the
+            # full-file UTF-8 decode is skipped.
+            return key, Path(output_file).read_bytes()
+
+        # The exports are independent — same read-only fixture, distinct
+        # output files — so overlap their filesystem work across threads.
+        with ThreadPoolExecutor(max_workers=len(export_cases)) as executor:
+            cls._outputs = dict(
+                executor.map(_run_export, export_cases.keys(), export_cases.values())
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        # Remove the temporary directory (fixture and outputs) after tests
+        cls._tmp.cleanup()
+
+    def assertAllIn(self, needles, content):
+        """
+        Assert every needle appears in content using one alternation scan
+        instead of one full str.find pass per needle.
+        """
+        pattern = _needle_pattern(tuple(needles))
+        found = {m.group(0) for m in pattern.finditer(content)}
+        # A needle overlapped by another match can be absent from `found`
+        # even though it occurs in content; give leftovers a direct scan
+        # before calling them missing.
+        missing = [n for n in needles if n not in found and n not in content]
+        self.assertFalse(missing, f"Not found in output: {missing}")
 
     def test_only_include_file(self):
-        output_file = 'output_include_only.txt'
-        export_folder_contents(
-            root_dir=self.test_dir,
-            output_file=output_file,
-            ignore_file=None,
-            include_file=os.path.join(self.test_dir, 'include_patterns.txt')
-        )
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        self.assertIn('include_me.txt', content)
-        self.assertNotIn('ignore_me.txt', content)
-        os.remove(output_file)
+        content = self._outputs['include_only']
+        self.assertIn(b'include_me.txt', content)
+        self.assertNotIn(b'ignore_me.txt', content)
 
     def test_only_ignore_file(self):
-        output_file = 'output_ignore_only.txt'
-        export_folder_contents(
-            root_dir=self.test_dir,
-            output_file=output_file,
-            ignore_file=os.path.join(self.test_dir, '.gitignore')
-        )
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        self.assertIn('include_me.txt', content)
-        self.assertNotIn('ignore_me.txt', content)
-        os.remove(output_file)
+        content = self._outputs['ignore_only']
+        self.assertIn(b'include_me.txt', content)
+        self.assertNotIn(b'ignore_me.txt', content)
 
     def test_both_include_and_ignore_files(self):
-        output_file = 'output_both.txt'
-        export_folder_contents(
-            root_dir=self.test_dir,
-            output_file=output_file,
-            ignore_file=os.path.join(self.test_dir, '.gitignore'),
-            include_file=os.path.join(self.test_dir, 'include_patterns.txt')
-        )
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        self.assertIn('include_me.txt', content)
-        self.assertNotIn('ignore_me.txt', content)
-        os.remove(output_file)
+        content = self._outputs['both']
+        self.assertIn(b'include_me.txt', content)
+        self.assertNotIn(b'ignore_me.txt', content)
 
     def test_notebook_exclude_outputs(self):
         """
         Test that notebook outputs are excluded by default (exclude_notebook_outputs=True).
         """
-        output_file = 'output_nb_exclude.txt'
-        export_folder_contents(
-            root_dir=self.test_dir,
-            output_file=output_file,
-            ignore_file=os.path.join(self.test_dir, '.gitignore')
-        )
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self._outputs['ignore_only']
         # The notebook should appear, but outputs should not be included in the exported content.
-        self.assertIn('test_notebook.ipynb', content)
+        self.assertIn(b'test_notebook.ipynb', content)
+        # The full stripped JSON should be embedded verbatim.
+        self.assertIn(_STRIPPED_NB_BYTES, content)
         # Outputs should not be present, only a placeholder line (if any).
-        self.assertNotIn('output_type', content)
-        os.remove(output_file)
+        self.assertNotIn(b'output_type', content)
 
     def test_notebook_include_outputs(self):
         """
         Test that notebook outputs can be included if exclude_notebook_outputs=False.
         """
-        output_file = 'output_nb_include.txt'
-        export_folder_contents(
-            root_dir=self.test_dir,
-            output_file=output_file,
-            ignore_file=os.path.join(self.test_dir, '.gitignore'),
-            exclude_notebook_outputs=False
-        )
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        # The notebook should appear and outputs should be present.
-        self.assertIn('test_notebook.ipynb', content)
-        self.assertIn('output_type', content)
-        os.remove(output_file)
+        content = self._outputs['nb_include']
+        # The notebook should appear and outputs should be present; with
+        # outputs included the original notebook bytes pass through verbatim.
+        self.assertIn(b'test_notebook.ipynb', content)
+        self.assertIn(_NB_JSON_BYTES, content)
+        self.assertIn(b'output_type', content)
 
     def test_notebook_convert_to_py(self):
         """
         Test that when convert_notebook_to_py=True,
         the notebook is converted to a .py-like format without outputs.
         """
-        output_file = 'output_nb_py.txt'
-        export_folder_contents(
-            root_dir=self.test_dir,
-            output_file=output_file,
-            ignore_file=os.path.join(self.test_dir, '.gitignore'),
-            convert_notebook_to_py=True
-        )
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self._outputs['nb_py']
         # The notebook should appear in a .py-like representation.
         # Check that code cells and markdown are commented/formatted correctly.
-        self.assertIn('test_notebook.ipynb', content)
-        self.assertIn('# === Markdown Cell ===', content)
-        self.assertIn('# This is a markdown cell', content)
-        self.assertIn('# === Code Cell ===', content)
-        self.assertIn("print('Hello World')", content)
+        self.assertAllIn([
+            b'test_notebook.ipynb',
+            b'# === Markdown Cell ===',
+            b'# This is a markdown cell',
+            b'# === Code Cell ===',
+            b"print('Hello World')",
+        ], content)
         # No outputs should be present in the .py version
-        self.assertNotIn('Hello World\n', content)
-        os.remove(output_file)
+        self.assertNotIn(b'Hello World\n', content)
 
 
 if __name__ == '__main__':